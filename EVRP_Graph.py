@@ -1,5 +1,9 @@
 import numpy as np
-from utility import euclidean_distance
+
+try:
+    from scipy.spatial.distance import pdist, squareform
+except ImportError:  # SciPy is optional, fall back to the NumPy implementation
+    pdist = squareform = None
 
 class Graph_EVRP_TW():
     """
@@ -24,10 +28,13 @@ class Graph_EVRP_TW():
         self.Customer_Idx = list(range(1, 1 + len(self.Customer_nodes)))  # Indices of customers
         self.RS_Idx = list(range(1 + len(self.Customer_nodes), len(self.Nodes) - 1))  # Indices of refueling stations
 
+        # Per-node data stored as contiguous arrays
+        self.Positions = np.array([node.Position for node in self.Nodes], dtype=np.float64)  # (N, 2) node coordinates
+        self.CustomerTW = np.array([node.Window for node in self.Nodes], dtype=np.float64)  # (N, 2) time windows of customers
+        self.CustomerServiceTime = np.array([node.ServiceTime for node in self.Nodes], dtype=np.float64)  # Service times of customers
+        self.CustomerDemand = np.array([node.Demand for node in self.Nodes], dtype=np.float64)  # Customer demands
+
         self.distance_matrix = self.generate_distance_matrix()  # Generate distance matrix
-        self.CustomerTW = [node.Window for node in self.Nodes]  # Time windows of customers
-        self.CustomerServiceTime = [node.ServiceTime for node in self.Nodes]  # Service times of customers
-        self.CustomerDemand = [node.Demand for node in self.Nodes]  # Customer demands
 
         # Vehicle parameters from the 'parameters' dictionary
         self.Q = parameters['Q']    # Vehicle fuel tank capacity
@@ -36,8 +43,12 @@ class Graph_EVRP_TW():
         self.g = parameters['g']    # Inverse refueling rate
         self.v = parameters['v']    # Average vehicle velocity
 
-        # Travel time matrix calculated based on distance and velocity
-        self.travel_time_matrix = self.distance_matrix / self.v
+        # Travel time matrix calculated based on distance and velocity.
+        # With unit velocity it is the distance matrix itself, so the array is shared instead of copied.
+        if self.v == 1.0:
+            self.travel_time_matrix = self.distance_matrix
+        else:
+            self.travel_time_matrix = self.distance_matrix * (1.0 / self.v)
 
     def print_info(self):
         """
@@ -61,11 +72,16 @@ class Graph_EVRP_TW():
         Returns:
             np.array: Distance matrix where each entry [i, j] represents the distance between node i and node j.
         """
-        distance_matrix = np.zeros((len(self.Nodes), len(self.Nodes)))
-        for i in range(len(self.Nodes)):
-            for j in range(i, len(self.Nodes)):
-                distance_matrix[i][j] = euclidean_distance(self.Nodes[i].Position, self.Nodes[j].Position)
-        # Mirror the matrix to make it symmetric
-        distance_matrix += distance_matrix.transpose()
-        distance_matrix = distance_matrix * 1.0
-        return np.array(distance_matrix)
\ No newline at end of file
+        if pdist is not None:
+            # Condensed upper triangle computed in a single pass, then expanded to the full symmetric matrix
+            return squareform(pdist(self.Positions, 'euclidean'))
+
+        # Positions are strictly 2-D: split them into contiguous x and y vectors so every
+        # broadcast below runs over unit-stride memory instead of (N, 2) columns
+        x, y = np.ascontiguousarray(self.Positions.T)
+        # Pairwise x and y differences via broadcasting, each of shape (N, N)
+        dx = x[:, None] - x[None, :]
+        dy = y[:, None] - y[None, :]
+        # Reuse the dx buffer for the result instead of allocating another N x N array
+        distance_matrix = np.hypot(dx, dy, out=dx)
+        return distance_matrix
@@ -38,6 +38,13 @@ class EVPR_TW_Solver:
         self.V_Prime_N_plus_1_sequence = self.V_sequence + self.F_Prime_sequence + [self.D[-1]]  # All nodes + end depot
         self.V_Prime_0_sequence = [self.D[0]] + self.V_sequence + self.F_Prime_sequence  # Start depot + all nodes
         self.V_Prime_sequence = self.V_sequence + self.F_Prime_sequence  # All customer and RS nodes
+        self.F_Prime_set = set(self.F_Prime_sequence)  # Recharging station node indices for membership tests
+
+        # RS copies: F_Prime_sequence holds RS_dummy_count consecutive copies of the RS list,
+        # RS_copies[s] lists the node indices of every copy of station s in order
+        num_rs = len(Graph.RS_nodes)
+        self.RS_copies = [self.F_Prime_sequence[s::num_rs] for s in range(num_rs)]
+        self.RS_station = {idx: s for s, copies in enumerate(self.RS_copies) for idx in copies}  # Node index -> station
 
         # Graph-related attributes (parameters)
         self.C = Graph.C  # Vehicle load capacity
@@ -65,111 +72,212 @@ class EVPR_TW_Solver:
 
     def _set_decision_variable(self):
         """Define decision variables for path links, time, load, and battery levels."""
-        # Path link variables (binary)
-        self.path_link_variable = [f"x_{i}_{j}" for i in range(self.model_size) for j in range(self.model_size) if i != j]
-        self.objective_function_coef = [self.distance_matrix[i][j] for i in range(self.model_size) for j in range(self.model_size) if i != j]
+        # Path link variables (binary), one per ordered node pair (i, j) that can appear in a feasible route
+        self.path_links = [(i, j) for i in range(self.model_size) for j in range(self.model_size) if self._is_feasible_link(i, j)]
+        # x_names[i][j] is None for pairs without a path link variable
+        self.x_names = [[None] * self.model_size for _ in range(self.model_size)]
+        for i, j in self.path_links:
+            self.x_names[i][j] = f"x_{i}_{j}"
+        self.path_link_variable = [self.x_names[i][j] for i, j in self.path_links]
+        self.objective_function_coef = [self.distance_matrix[i, j] for i, j in self.path_links]
 
         # Continuous variables for time (tao), load (u), and battery (y)
         self.tao_names = [f"tao_{i}" for i in range(self.model_size)]
         self.u_names = [f"u_{i}" for i in range(self.model_size)]
         self.y_names = [f"y_{i}" for i in range(self.model_size)]
 
+    def _is_feasible_link(self, i, j):
+        """
+        Presolve check for the path link x_ij. Links that no feasible solution can use get no variable and no constraints:
+        - self loops, links into the start depot and links out of the end depot (they appear in no constraint);
+        - links between two copies of the same RS (charging again at the same place is never better than charging once);
+        - links whose energy h*d_ij exceeds the battery capacity Q;
+        - links from the start depot or a customer that cannot reach j before its due date, even when leaving i at its ready time.
+        """
+        if i == j or j == self.Depot_start[0] or i == self.Depot_end[0]:
+            return False
+        if i in self.RS_station and self.RS_station[i] == self.RS_station.get(j):
+            return False
+        if self.h * self.distance_matrix[i, j] > self.Q:
+            return False
+        # The RS travel time constraint has no travel time term, so only non-RS departures are checked
+        if i not in self.F_Prime_set:
+            earliest_arrival = self.CustomerTimeWindow[i, 0] + self.CustomerService[i] + self.Travel_Time[i, j]
+            if earliest_arrival > self.CustomerTimeWindow[j, 1]:
+                return False
+        return True
+
     def _set_objective_function(self):
         """Define the objective function (minimizing the total travel distance)."""
         self.model.objective.set_sense(self.model.objective.sense.minimize)
 
-        # Add path link variables to the model with objective function coefficients
-        self.model.variables.add(names=self.path_link_variable, obj=self.objective_function_coef, types=["B"] * len(self.path_link_variable))
-        
-        # Add continuous variables for time, load, and battery with appropriate bounds
-        for i in range(self.model_size):
-            self.model.variables.add(names=[self.tao_names[i]], obj=[0], types=["C"], lb=[self.CustomerTimeWindow[i][0]], ub=[self.CustomerTimeWindow[i][1]])
-            self.model.variables.add(names=[self.u_names[i]], obj=[0], types=["C"], lb=[0], ub=[self.C])
-            Initial_Battery = self.Q if i == 0 else 0  # Initial battery for the depot is full
-            self.model.variables.add(names=[self.y_names[i]], obj=[0], types=["C"], lb=[Initial_Battery], ub=[self.Q])
+        # Add all variables to the model in a single call, in the column order
+        # [path links x | time tao | load u | battery y]; only the path links carry objective coefficients.
+        n = self.model_size
+        num_links = len(self.path_link_variable)
+        names = self.path_link_variable + self.tao_names + self.u_names + self.y_names
+        obj = self.objective_function_coef + [0] * (3 * n)
+        types = ["B"] * num_links + ["C"] * (3 * n)
+        lb = ([0] * num_links + self.CustomerTimeWindow[:, 0].tolist()  # Time windows
+              + [0] * n  # Load
+              + [self.Q] + [0] * (n - 1))  # Battery, initial battery for the depot is full
+        ub = [1] * num_links + self.CustomerTimeWindow[:, 1].tolist() + [self.C] * n + [self.Q] * n
+
+        base = self.model.variables.get_num()
+        self.model.variables.add(names=names, obj=obj, types=types, lb=lb, ub=ub)
+
+        # The column index of every variable is recorded so constraints can refer to it without a name lookup
+        self.x_idx = [[None] * self.model_size for _ in range(self.model_size)]  # x_idx[i][j] is None for pairs without a variable
+        for k, (i, j) in enumerate(self.path_links):
+            self.x_idx[i][j] = base + k
+        base += num_links
+        self.tao_idx = list(range(base, base + n))
+        self.u_idx = list(range(base + n, base + 2 * n))
+        self.y_idx = list(range(base + 2 * n, base + 3 * n))
 
     def _set_constraints(self):
-        """Define the constraints for the EVRP-TW problem."""
-        # Constraints for customers (each customer must be visited exactly once)
+        """
+        Define the constraints for the EVRP-TW problem.
+        Each block builder returns its rows as (lin_exprs, sense, rhs); all rows are handed to CPLEX in a single call.
+        Only pairs that kept a path link variable in presolve (x_idx[i][j] is not None) get rows.
+        """
+        # Constant coefficient vectors shared by the row builders; rows take a prefix of the needed length
+        self.ones = [1] * self.model_size
+        self.minus_ones = [-1] * self.model_size
+
+        blocks = [
+            self._customer_visit_constraints(),
+            self._rs_visit_constraints(),
+            self._rs_copy_order_constraints(),
+            self._route_consistency_constraints(),
+            self._travel_time_constraints_customer(),
+            self._travel_time_constraints_rs(),
+            self._load_capacity_constraints(),
+            self._battery_constraints_customer(),
+            self._battery_constraints_rs(),
+        ]
+        lin_exprs, senses, rhs = [], [], []
+        for block_exprs, sense, block_rhs in blocks:
+            lin_exprs += block_exprs
+            senses += [sense] * len(block_exprs)
+            rhs += [block_rhs] * len(block_exprs)
+        if lin_exprs:
+            self.model.linear_constraints.add(lin_expr=lin_exprs, senses=senses, rhs=rhs)
+
+    def _customer_visit_constraints(self):
+        """Constraints for customers (each customer must be visited exactly once)."""
+        x = self.x_idx
+        lin_exprs = []
         for i in self.V_sequence:
-            self.model.linear_constraints.add(
-                lin_expr=[[ [f"x_{i}_{j}" for j in self.V_Prime_N_plus_1_sequence if i != j], [1] * (len(self.V_Prime_N_plus_1_sequence) - 1) ]],
-                senses=["E"],
-                rhs=[1]  # Exactly one outgoing edge from customer i
-            )
+            out_vars = [x[i][j] for j in self.V_Prime_N_plus_1_sequence if x[i][j] is not None]
+            lin_exprs.append([out_vars, self.ones[:len(out_vars)]])
+        return lin_exprs, "E", 1  # Exactly one outgoing edge from customer i
 
-        # Constraints for recharging stations (at most one visit per RS in each route)
+    def _rs_visit_constraints(self):
+        """Constraints for recharging stations (at most one visit per RS in each route)."""
+        x = self.x_idx
+        lin_exprs = []
         for i in self.F_Prime_sequence:
-            self.model.linear_constraints.add(
-                lin_expr=[[ [f"x_{i}_{j}" for j in self.V_Prime_N_plus_1_sequence if i != j], [1] * (len(self.V_Prime_N_plus_1_sequence) - 1) ]],
-                senses=["L"],
-                rhs=[1]  # At most one outgoing edge from RS i in this route
-            )
+            out_vars = [x[i][j] for j in self.V_Prime_N_plus_1_sequence if x[i][j] is not None]
+            lin_exprs.append([out_vars, self.ones[:len(out_vars)]])
+        return lin_exprs, "L", 1  # At most one outgoing edge from RS i in this route
 
-        # Route consistency constraints
+    def _rs_copy_order_constraints(self):
+        """
+        Symmetry breaking for RS copies: copy k of a station may only be used if copy k-1 is used.
+        sum_j x_(c_k)j - sum_j x_(c_k-1)j <= 0
+        """
+        x = self.x_idx
+        lin_exprs = []
+        for copies in self.RS_copies:
+            for prev_copy, copy in zip(copies, copies[1:]):
+                out_vars = [x[copy][j] for j in self.V_Prime_N_plus_1_sequence if x[copy][j] is not None]
+                prev_vars = [x[prev_copy][j] for j in self.V_Prime_N_plus_1_sequence if x[prev_copy][j] is not None]
+                lin_exprs.append([out_vars + prev_vars, self.ones[:len(out_vars)] + self.minus_ones[:len(prev_vars)]])
+        return lin_exprs, "L", 0
+
+    def _route_consistency_constraints(self):
+        """Route consistency constraints (flow balance at every customer and RS)."""
+        x = self.x_idx
+        lin_exprs = []
         for j in self.V_Prime_sequence:
-            in_vars = [f"x_{j}_{i_start}" for i_start in self.V_Prime_N_plus_1_sequence if i_start != j]
-            out_vars = [f"x_{i_end}_{j}" for i_end in self.V_Prime_0_sequence if i_end != j]
-            self.model.linear_constraints.add(
-                lin_expr=[[in_vars + out_vars, [1] * len(in_vars) + [-1] * len(out_vars)]],
-                senses=["E"],
-                rhs=[0]  # Flow balance
-            )
-
-        # Subtour elimination: travel time and battery constraints
-        # Travel Time Constraint(Customer)
-        # tao_i - tao_j + (t_ij + s_i + l_0)x_ij <= l_0
+            in_vars = [x[j][i_start] for i_start in self.V_Prime_N_plus_1_sequence if x[j][i_start] is not None]
+            out_vars = [x[i_end][j] for i_end in self.V_Prime_0_sequence if x[i_end][j] is not None]
+            lin_exprs.append([in_vars + out_vars, self.ones[:len(in_vars)] + self.minus_ones[:len(out_vars)]])
+        return lin_exprs, "E", 0  # Flow balance
+
+    # Subtour elimination: travel time and battery constraints
+    def _travel_time_constraints_customer(self):
+        """
+        Travel Time Constraint(Customer)
+        tao_i - tao_j + (t_ij + s_i + l_0)x_ij <= l_0
+        """
+        x, tao = self.x_idx, self.tao_idx
+        tt, svc = self.Travel_Time, self.CustomerService  # Local aliases for the loops
+        lin_exprs = []
         for i in self.Depot_start + self.V_sequence:
+            coef_i = svc[i] + self.l_0  # Part of the x_ij coefficient that does not depend on j
             for j in self.V_Prime_N_plus_1_sequence:
-                if i != j:
-                    self.model.linear_constraints.add(
-                        lin_expr=[[ [f"tao_{i}", f"tao_{j}", f"x_{i}_{j}"], [1, -1, self.Travel_Time[i][j] + self.CustomerService[i] + self.l_0] ]],
-                        senses=["L"],
-                        rhs=[self.l_0]
-                    )
-        # Travel Time Constraint(RS)
-        # tao_i - tao_j + (l_0 + g*Q)x_ij -g*y_i <= l_0
+                if x[i][j] is not None:
+                    lin_exprs.append([[tao[i], tao[j], x[i][j]], [1, -1, tt[i, j] + coef_i]])
+        return lin_exprs, "L", self.l_0
+
+    def _travel_time_constraints_rs(self):
+        """
+        Travel Time Constraint(RS)
+        tao_i - tao_j + (l_0 + g*Q)x_ij -g*y_i <= l_0
+        """
+        x, tao, y = self.x_idx, self.tao_idx, self.y_idx
+        coef = [1, -1, self.l_0 + self.g * self.Q, -self.g]  # Same coefficients for every row
+        lin_exprs = []
         for i in self.F_Prime_sequence:
             for j in self.V_Prime_N_plus_1_sequence:
-                if i != j:
-                    self.model.linear_constraints.add(
-                        lin_expr=[[ [f"tao_{i}", f"tao_{j}", f"x_{i}_{j}", f"y_{i}"], [1, -1, self.l_0 + self.g * self.Q, -self.g] ]],
-                        senses=["L"],
-                        rhs=[self.l_0]
-                    )
-
-        # Load Capacity Constraint
-        # u_j - u_i +(C + q_i)x_ij <= C
+                if x[i][j] is not None:
+                    lin_exprs.append([[tao[i], tao[j], x[i][j], y[i]], coef])
+        return lin_exprs, "L", self.l_0
+
+    def _load_capacity_constraints(self):
+        """
+        Load Capacity Constraint
+        u_j - u_i +(C + q_i)x_ij <= C
+        """
+        x, u = self.x_idx, self.u_idx
+        dem = self.CustomerDemand  # Local alias for the loop
+        lin_exprs = []
         for i in self.V_Prime_0_sequence:
+            coef_i = [1, -1, self.C + dem[i]]  # Same coefficients for every row of node i
             for j in self.V_Prime_N_plus_1_sequence:
-                if i != j:
-                    self.model.linear_constraints.add(
-                        lin_expr=[[ [f"u_{j}", f"u_{i}", f"x_{i}_{j}"], [1, -1, self.C + self.CustomerDemand[i]] ]],
-                        senses=["L"],
-                        rhs=[self.C]
-                    )
-
-        # Battery Constraints(Customers)
-        # y_j - y_i + (h*d_ij +Q)x_ij <= Q
+                if x[i][j] is not None:
+                    lin_exprs.append([[u[j], u[i], x[i][j]], coef_i])
+        return lin_exprs, "L", self.C
+
+    def _battery_constraints_customer(self):
+        """
+        Battery Constraints(Customers)
+        y_j - y_i + (h*d_ij +Q)x_ij <= Q
+        """
+        x, y = self.x_idx, self.y_idx
+        dm = self.distance_matrix  # Local alias for the loop
+        lin_exprs = []
         for i in self.V_sequence:
             for j in self.V_Prime_N_plus_1_sequence:
-                if i != j:
-                    self.model.linear_constraints.add(
-                        lin_expr=[[ [f"y_{j}", f"y_{i}", f"x_{i}_{j}"], [1, -1, self.h * self.distance_matrix[i][j] + self.Q] ]],
-                        senses=["L"],
-                        rhs=[self.Q]
-                    )
-
-        # Battery Constraints(RS)
-        # y_j + h*d_ij*x_ij <= Q
+                if x[i][j] is not None:
+                    lin_exprs.append([[y[j], y[i], x[i][j]], [1, -1, self.h * dm[i, j] + self.Q]])
+        return lin_exprs, "L", self.Q
+
+    def _battery_constraints_rs(self):
+        """
+        Battery Constraints(RS)
+        y_j + h*d_ij*x_ij <= Q
+        """
+        x, y = self.x_idx, self.y_idx
+        dm = self.distance_matrix  # Local alias for the loop
+        lin_exprs = []
         for i in self.Depot_start + self.F_Prime_sequence:
             for j in self.V_Prime_N_plus_1_sequence:
-                if i != j:
-                    self.model.linear_constraints.add(
-                        lin_expr=[[ [f"y_{j}", f"x_{i}_{j}"], [1, self.h * self.distance_matrix[i][j]] ]],
-                        senses=["L"],
-                        rhs=[self.Q]
-                    )
+                if x[i][j] is not None:
+                    lin_exprs.append([[y[j], x[i][j]], [1, self.h * dm[i, j]]])
+        return lin_exprs, "L", self.Q
 
     def solver(self):
         """Solve the EVRP-TW problem using CPLEX."""
@@ -181,18 +289,19 @@ class EVPR_TW_Solver:
             print("Optimal Value: ", self.model.solution.get_objective_value())
 
         if DV_Info or Routes:
-            Routes = {}
-            for i in range(self.model_size):
-                for j in range(self.model_size):
-                    if i != j and self.model.solution.get_values(f"x_{i}_{j}") > 0.5:
-                        if DV_Info:
-                            print(f"x_{i}_{j}:", self.model.solution.get_values(f"x_{i}_{j}"))
-                        Routes[f"x_{i}_{j}"] = 1
+            values = self.model.solution.get_values()  # Full solution vector, fetched in one call
+            active_links = []  # Selected path links as (i, j) pairs
+            for i, j in self.path_links:
+                value = values[self.x_idx[i][j]]
+                if value > 0.5:
+                    if DV_Info:
+                        print(f"x_{i}_{j}:", value)
+                    active_links.append((i, j))
 
             if DV_Info:
-                print("Travel Time: ", {f"tao_{i}": self.model.solution.get_values(f"tao_{i}") for i in range(self.model_size)})
-                print("Load Capacity: ", {f"u_{i}": self.model.solution.get_values(f"u_{i}") for i in range(self.model_size)})
-                print("Battery Level: ", {f"y_{i}": self.model.solution.get_values(f"y_{i}") for i in range(self.model_size)})
+                print("Travel Time: ", {f"tao_{i}": values[self.tao_idx[i]] for i in range(self.model_size)})
+                print("Load Capacity: ", {f"u_{i}": values[self.u_idx[i]] for i in range(self.model_size)})
+                print("Battery Level: ", {f"y_{i}": values[self.y_idx[i]] for i in range(self.model_size)})
 
             if Routes:
-                find_and_print_routes(Routes, end_node_idx=self.D[-1])  # Use utility function to print routes
+                find_and_print_routes(active_links, end_node_idx=self.D[-1])  # Use utility function to print routes
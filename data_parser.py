@@ -1,5 +1,9 @@
 import re
 
+# Line patterns for node rows and vehicle parameters, compiled once at import
+NODE_RE = re.compile(r'^(\w+)\s+([dcf])\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)', re.MULTILINE)
+PARAM_RE = re.compile(r'^([QCrgv])\s.*\/([\d.]+)\/', re.MULTILINE)
+
 # File path to the dataset
 class Node:
     """
@@ -71,40 +75,29 @@ def parse_file(file_path):
     # v(average velocity)
     parameters = {}  
     
-    # Open the file for reading
+    # Read the whole file and parse node rows and parameters in one pass each
     with open(file_path, 'r') as file:
-        for line in file:
-            # Use regular expressions to parse lines for nodes or parameters
-            node_match = re.match(r'(\w+)\s+([dcf])\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)', line)
-            parameter_match = re.match(r'([QCrgv])\s.*\/([\d.]+)\/', line)
+        text = file.read()
+
+    for StringId, Type, Pos_x, Pos_y, Demand, Window_S, Window_E, ServiceTime in NODE_RE.findall(text):
+        # Extract node data
+        node_data = Node(StringId, Type, float(Pos_x), float(Pos_y), float(Demand),
+                         float(Window_S), float(Window_E), float(ServiceTime))
+
+        # Categorize nodes based on the ID prefix
+        if node_data.StringId.startswith("D"):
+            Depot_nodes.append(node_data)
+        elif node_data.StringId.startswith("S"):
+            RS_nodes.append(node_data)
+        elif node_data.StringId.startswith("C"):
+            Customer_nodes.append(node_data)
+        else:
+            raise ValueError("Unexpected Data Type: {}".format(node_data.StringId[0]))
 
-            if node_match:
-                # Extract node data
-                node_data = Node()
-                node_data.StringId = node_match.group(1)
-                node_data.Type = node_match.group(2)
-                node_data.Position = [float(node_match.group(3)), float(node_match.group(4))]
-                node_data.Demand = float(node_match.group(5))
-                node_data.Window = [float(node_match.group(6)), float(node_match.group(7))]
-                node_data.ServiceTime = float(node_match.group(8))
+    # Extract vehicle-related parameters
+    for key, value in PARAM_RE.findall(text):
+        parameters[key] = float(value)
 
-                # Categorize nodes based on the ID prefix
-                if node_data.StringId.startswith("D"):
-                    Depot_nodes.append(node_data)
-                elif node_data.StringId.startswith("S"):
-                    RS_nodes.append(node_data)
-                elif node_data.StringId.startswith("C"):
-                    Customer_nodes.append(node_data)
-                else:
-                    raise ValueError("Unexpected Data Type: {}".format(node_data.StringId[0]))
-                
-            elif parameter_match:
-                # Extract vehicle-related parameters
-                parameter_data = {
-                    parameter_match.group(1): float(parameter_match.group(2))
-                }
-                parameters.update(parameter_data)
-                
     # Sometimes the RS[0] is the depot, which results in duplicate computation
     if Customer_nodes[0].Position == Depot_nodes[0].Position:
         Customer_nodes.pop(0)
@@ -1,41 +1,71 @@
-import numpy as np
-# Utility function to find and print all routes from start nodes to an end node
-def find_and_print_routes(sequence, end_node_idx=5):
+from math import hypot
+# Utility function to find all routes from start nodes to an end node
+def find_routes(sequence, end_node_idx=5):
+    """
+    Find every route that leaves the start depot and reaches the end depot.
+
+    Args:
+        sequence (iterable): Selected path links as (i, j) node index pairs.
+        end_node_idx (int): Index of the end depot.
+
+    Returns:
+        list: Complete routes, each a list of (i, j) edges in travel order.
+    """
     routes = []  # Store all complete routes
-    visited = set()  # Track visited nodes
-
-    # Recursive function to find paths
-    def find_route(current_node, current_route):
-        i, j = map(int, current_node.split('_')[1:])  # Extract node indices i and j
-        current_route.append(current_node)  # Add the current node to the current route
-
-        # If we reach the end node x_j_0, the route is complete
-        if j == end_node_idx:
-            routes.append(current_route[:])  # Save the complete route
-            return
-
-        # Look for the next connected node that continues the path
-        for next_node in sequence:
-            if next_node not in visited:
-                next_i, next_j = map(int, next_node.split('_')[1:])
+
+    # Give every edge a small integer id and build the successor map: i -> [edge ids leaving i]
+    edges = [tuple(edge) for edge in sequence]
+    adj = {}
+    for edge_id, (i, _) in enumerate(edges):
+        adj.setdefault(i, []).append(edge_id)
+    visited = [False] * len(edges)  # visited[edge_id] is True while the edge is on the current route
+
+    # Depth-first walk from every edge x_0_k, using an explicit stack of successor iterators
+    for start_id, (start_i, start_j) in enumerate(edges):
+        if start_i != 0:
+            continue
+        if start_j == end_node_idx:
+            routes.append([edges[start_id]])
+            continue
+        current_route = [start_id]  # Edge ids on the current route
+        visited[start_id] = True
+        stack = [iter(adj.get(start_j, ()))]
+        while stack:
+            for edge_id in stack[-1]:
+                if visited[edge_id]:
+                    continue
                 # Ensure the path continuity: x_i_j -> x_j_m
-                if next_i == j:
-                    visited.add(next_node)  # Mark node as visited
-                    find_route(next_node, current_route)  # Recur for the next node
-                    visited.remove(next_node)  # Backtrack to explore other possibilities
-        current_route.pop()  # Backtrack to the previous node
-
-    # Iterate over the sequence and find all routes starting with x_0_k
-    for start_node in sequence:
-        if start_node.startswith('x_0_') and start_node not in visited:
-            visited.add(start_node)
-            find_route(start_node, [])  # Start finding routes from each valid start node
-            visited.remove(start_node)  # Remove after route is completed
+                next_j = edges[edge_id][1]
+                if next_j == end_node_idx:
+                    routes.append([edges[k] for k in current_route] + [edges[edge_id]])  # Save the complete route
+                    continue
+                visited[edge_id] = True
+                current_route.append(edge_id)
+                stack.append(iter(adj.get(next_j, ())))
+                break
+            else:
+                # All successors explored, backtrack to the previous edge
+                stack.pop()
+                visited[current_route.pop()] = False
+
+    return routes
+
+
+# Utility function to find and print all routes from start nodes to an end node
+def find_and_print_routes(sequence, end_node_idx=5):
+    """
+    Find and print every route that leaves the start depot and reaches the end depot.
+
+    Args:
+        sequence (iterable): Selected path links as (i, j) node index pairs.
+        end_node_idx (int): Index of the end depot.
+    """
+    routes = find_routes(sequence, end_node_idx)
 
     # Print all complete routes
     print(f"Total number of complete routes: {len(routes)}")
     for idx, route in enumerate(routes):
-        print(f"Route {idx + 1}: {' -> '.join(route)}")
+        print(f"Route {idx + 1}: {' -> '.join(f'x_{i}_{j}' for i, j in route)}")
 
 
 # Function to calculate Euclidean distance between two nodes
@@ -50,4 +80,4 @@ def euclidean_distance(pos1, pos2):
     Returns:
         float: Euclidean distance between the two nodes.
     """
-    return np.sqrt((pos2[0] - pos1[0])**2 + (pos2[1] - pos1[1])**2)
+    return hypot(pos2[0] - pos1[0], pos2[1] - pos1[1])